@@ -1,49 +1,135 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse, Response
 
-import psycopg2
-from psycopg2.extras import RealDictCursor
-from pymongo import MongoClient
-from neo4j import GraphDatabase
-import redis
-import json
+from cachetools import TTLCache
+import orjson
+from neo4j import AsyncGraphDatabase
+import asyncpg
+from motor.motor_asyncio import AsyncIOMotorClient
+import redis.asyncio as redis_asyncio
+import asyncio
 
-app = FastAPI(title="API Integração de Bancos de Dados")
+logger = logging.getLogger(__name__)
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
 # --------------------------
-# Conexões com os bancos
+# Conexões com os bancos (todas assíncronas, criadas no lifespan)
 # --------------------------
 
-pg_conn = psycopg2.connect(
-    host="postgres",
-    port=5432,
-    dbname="recomendador",
-    user="admin",
-    password="admin",
+pg_pool: asyncpg.Pool | None = None
+pg_listener_conn: asyncpg.Connection | None = None
+mongo_client: AsyncIOMotorClient | None = None
+mongo_db = None
+neo4j_driver = None
+redis_pool: redis_asyncio.ConnectionPool | None = None
+redis_client: redis_asyncio.Redis | None = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global pg_pool, pg_listener_conn, mongo_client, mongo_db
+    global neo4j_driver, redis_pool, redis_client
+
+    pg_pool = await asyncpg.create_pool(
+        host="postgres",
+        port=5432,
+        database="recomendador",
+        user="admin",
+        password="admin",
+        min_size=5,
+        max_size=20,
+        # cache de prepared statements por conexão: o texto das queries
+        # quentes (cliente por id, compras) é parseado/planejado uma vez
+        # e reutilizado nas requisições seguintes
+        statement_cache_size=1024,
+    )
+
+    mongo_client = AsyncIOMotorClient("mongodb://mongo:27017")
+    mongo_db = mongo_client["recomendador_docs"]
+
+    neo4j_driver = AsyncGraphDatabase.driver(
+        "bolt://neo4j:7687",
+        auth=("neo4j", "senha123"),
+    )
+
+    # decode_responses=False: os valores são payloads binários (orjson),
+    # o GET devolve bytes direto, sem decode UTF-8 no caminho quente.
+    # Mantemos orjson em vez de msgpack porque os bytes já são JSON
+    # válido e podem ser servidos na resposta HTTP sem reconversão.
+    # O pool explícito limita as conexões e faz PING periódico, trocando
+    # conexões mortas sem a requisição pagar o reconnect.
+    redis_pool = redis_asyncio.ConnectionPool(
+        host="redis",
+        port=6379,
+        db=0,
+        max_connections=64,
+        health_check_interval=30,
+        decode_responses=False,
+    )
+    redis_client = redis_asyncio.Redis(connection_pool=redis_pool)
+
+    # conexão dedicada para LISTEN: os triggers em clientes/compras (ver
+    # README) notificam o id alterado e só essa chave é reconsolidada,
+    # sem varrer a base inteira
+    pg_listener_conn = await asyncpg.connect(
+        host="postgres",
+        port=5432,
+        database="recomendador",
+        user="admin",
+        password="admin",
+    )
+    await pg_listener_conn.add_listener("cliente_changed", _ao_notificar_cliente)
+
+    yield
+
+    await pg_listener_conn.close()
+    await pg_pool.close()
+    mongo_client.close()
+    await neo4j_driver.close()
+    await redis_client.aclose()
+    await redis_pool.disconnect()
+    if _process_pool is not None:
+        _process_pool.shutdown()
+
+
+app = FastAPI(
+    title="API Integração de Bancos de Dados",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
-pg_conn.autocommit = True
 
-mongo_client = MongoClient("mongodb://mongo:27017")
-mongo_db = mongo_client["recomendador_docs"]
 
-neo4j_driver = GraphDatabase.driver(
-    "bolt://neo4j:7687",
-    auth=("neo4j", "senha123"),
-)
+def _default(obj):
+    """
+    Serializa tipos que o orjson não cobre nativamente
+    (Decimal vindo do Postgres, por exemplo).
+    """
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (Decimal, UUID)):
+        return str(obj)
+    raise TypeError
 
-redis_client = redis.Redis(
-    host="redis",
-    port=6379,
-    db=0,
-    decode_responses=True,  # retorna strings, não bytes
+
+def serializar(dados) -> bytes:
+    """Serializa um payload para guardar no Redis."""
+    return orjson.dumps(dados, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_methods=["*"],
+    allow_headers=["*"],
 )
 
 # --------------------------
@@ -52,34 +138,50 @@ redis_client = redis.Redis(
 
 
 @app.get("/")
-def root():
+async def root():
     return {"status": "ok", "message": "API de integração funcionando"}
 
 
 @app.get("/health")
-def health_check():
+async def health_check():
     """
     Verifica se os serviços respondem.
+
+    As quatro sondas rodam em paralelo, cada uma com timeout próprio: a
+    latência total é o máximo das quatro, e um backend travado não
+    congela o health check — aparece como False na resposta.
     """
-    try:
-        # Postgres
-        with pg_conn.cursor() as cur:
-            cur.execute("SELECT 1;")
-            cur.fetchone()
 
-        # Mongo
-        mongo_db.command("ping")
+    async def pg_ping():
+        async with pg_pool.acquire() as conn:
+            await conn.fetchval("SELECT 1;")
 
-        # Neo4j
-        with neo4j_driver.session() as session:
-            session.run("RETURN 1 AS n").single()
+    async def mongo_ping():
+        await mongo_db.command("ping")
 
-        # Redis
-        redis_client.ping()
+    async def neo_ping():
+        await neo4j_driver.execute_query("RETURN 1 AS n", database_="neo4j")
 
-        return {"postgres": True, "mongo": True, "neo4j": True, "redis": True}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    async def redis_ping():
+        await redis_client.ping()
+
+    resultados = await asyncio.gather(
+        asyncio.wait_for(pg_ping(), timeout=0.5),
+        asyncio.wait_for(mongo_ping(), timeout=0.5),
+        asyncio.wait_for(neo_ping(), timeout=0.5),
+        asyncio.wait_for(redis_ping(), timeout=0.5),
+        return_exceptions=True,
+    )
+
+    status = {
+        nome: not isinstance(resultado, BaseException)
+        for nome, resultado in zip(
+            ("postgres", "mongo", "neo4j", "redis"), resultados
+        )
+    }
+    if not all(status.values()):
+        return ORJSONResponse(status_code=503, content=status)
+    return status
 
 
 # --------------------------
@@ -87,112 +189,218 @@ def health_check():
 # --------------------------
 
 
-def montar_dados_consolidados_cliente(cliente_id: int) -> dict:
+async def montar_payload_consolidado_cliente(cliente_id: int) -> bytes:
     """
-    Monta o pacote consolidado de dados de um cliente:
-    - dados do cliente (Postgres)
-    - compras (Postgres)
+    Monta o pacote consolidado de um cliente já como JSON (bytes):
+    - dados do cliente + compras (Postgres)
     - interesses e comportamento (Mongo)
     - amigos e indicações (Neo4j)
+
+    As três bases não dependem umas das outras, então as buscas rodam em
+    paralelo: a latência total vira o máximo das três, não a soma.
+
+    O Postgres devolve seu pedaço já serializado (json_build_object),
+    então o payload final é montado por concatenação de fragmentos, sem
+    converter linha -> dict -> JSON no interpretador.
     """
 
-    with pg_conn.cursor(cursor_factory=RealDictCursor) as cur:
-        cur.execute("SELECT * FROM clientes WHERE id = %s;", (cliente_id,))
-        cliente = cur.fetchone()
-        if not cliente:
+    async def buscar_postgres():
+        # um único round trip que sai do Postgres como texto JSON pronto:
+        # {"cliente": {...}, "compras": [...]}
+        async with pg_pool.acquire() as conn:
+            payload = await conn.fetchval(
+                """
+                SELECT json_build_object(
+                    'cliente', row_to_json(cl),
+                    'compras', COALESCE((
+                        SELECT json_agg(
+                            json_build_object(
+                                'id', co.id,
+                                'produto', p.produto,
+                                'tipo', p.tipo,
+                                'valor', p.valor,
+                                'data', co.data
+                            )
+                            ORDER BY co.data DESC
+                        )
+                        FROM compras co
+                        JOIN produtos p ON p.id = co.id_produto
+                        WHERE co.id_cliente = cl.id
+                    ), '[]'::json)
+                )::text
+                FROM clientes cl
+                WHERE cl.id = $1;
+                """,
+                cliente_id,
+            )
+        if payload is None:
             raise HTTPException(status_code=404, detail=f"Cliente {cliente_id} não encontrado")
-
-        cur.execute(
-            """
-            SELECT c.id, p.produto, p.tipo, p.valor, c.data
-            FROM compras c
-            JOIN produtos p ON p.id = c.id_produto
-            WHERE c.id_cliente = %s
-            ORDER BY c.data DESC;
-            """,
-            (cliente_id,),
+        return payload.encode()
+
+    async def buscar_mongo():
+        doc = await mongo_db.clientes_interesses.find_one(
+            {"cliente_id": cliente_id},
+            {"_id": 0},
+        ) or {}
+        return doc.get("interesses", []), doc.get("tags_comportamento", [])
+
+    async def buscar_neo4j():
+        # amigos e indicações em um único Cypher = um único round trip;
+        # o CASE evita que o collect gere um mapa de nulls quando o
+        # OPTIONAL MATCH não encontra nada
+        query = """
+        MATCH (c:Cliente {id_cliente: $id})
+        OPTIONAL MATCH (c)-[:AMIGO_DE]->(a:Cliente)
+        WITH c, collect(
+            CASE WHEN a IS NULL THEN NULL
+                 ELSE {id_cliente: a.id_cliente, nome: a.nome} END
+        ) AS amigos
+        OPTIONAL MATCH (c)-[r:INDICOU]->(i:Cliente)
+        RETURN amigos, collect(
+            CASE WHEN i IS NULL THEN NULL
+                 ELSE {id_cliente: i.id_cliente, nome: i.nome, produto: r.produto} END
+        ) AS indicacoes
+        """
+        # execute_query reaproveita sessões de um pool interno do driver,
+        # sem abrir/fechar sessão a cada requisição
+        records, _, _ = await neo4j_driver.execute_query(
+            query,
+            parameters_={"id": cliente_id},
+            database_="neo4j",
+        )
+        if not records:
+            return [], []
+        return records[0]["amigos"], records[0]["indicacoes"]
+
+    pg_payload, (interesses, tags_comportamento), (amigos, indicacoes) = (
+        await asyncio.gather(buscar_postgres(), buscar_mongo(), buscar_neo4j())
+    )
+
+    # concatena os fragmentos: pg_payload sem o '}' final + demais campos.
+    # (o Neo4j puro não traz APOC para serializar do lado do servidor,
+    # então amigos/indicações são serializados aqui com orjson)
+    return b"".join(
+        (
+            pg_payload[:-1],
+            b',"interesses":', serializar(interesses),
+            b',"tags_comportamento":', serializar(tags_comportamento),
+            b',"amigos":', serializar(amigos),
+            b',"indicacoes":', serializar(indicacoes),
+            b"}",
         )
-        compras = cur.fetchall()
+    )
 
 
-    doc_interesses = mongo_db.clientes_interesses.find_one(
-        {"cliente_id": cliente_id},
-        {"_id": 0},
-    ) or {}
+def chave_redis_cliente(cliente_id: int) -> str:
+    return f"cliente:{cliente_id}"
 
-    interesses = doc_interesses.get("interesses", [])
-    tags_comportamento = doc_interesses.get("tags_comportamento", [])
 
+# SET com as chaves cliente:* consolidadas; preenchido no rebuild para
+# os endpoints de listagem não precisarem varrer o keyspace
+CHAVE_INDICE_CLIENTES = "cliente_ids"
 
-    with neo4j_driver.session() as session:
-        query_amigos = """
-        MATCH (c:Cliente {id_cliente: $id})-[:AMIGO_DE]->(amigo:Cliente)
-        RETURN amigo.id_cliente AS id_cliente, amigo.nome AS nome
-        """
-        result_amigos = session.run(query_amigos, id=cliente_id)
-        amigos = [record.data() for record in result_amigos]
+# o event loop só guarda referência fraca para as tasks; sem este SET o
+# refresh agendado pelo LISTEN poderia ser coletado no meio da execução
+_tarefas_refresh: set[asyncio.Task] = set()
 
-        query_indicacoes = """
-        MATCH (c:Cliente {id_cliente: $id})-[r:INDICOU]->(amigo:Cliente)
-        RETURN amigo.id_cliente AS id_cliente, amigo.nome AS nome, r.produto AS produto
-        """
-        result_indicacoes = session.run(query_indicacoes, id=cliente_id)
-        indicacoes = [record.data() for record in result_indicacoes]
 
+async def _refrescar_cliente(cliente_id: int):
+    """
+    Reconsolida um único cliente no Redis após uma notificação de
+    alteração vinda do Postgres (LISTEN cliente_changed).
+    """
+    try:
+        key = chave_redis_cliente(cliente_id)
+        try:
+            payload = await montar_payload_consolidado_cliente(cliente_id)
+        except HTTPException:
+            # cliente não existe mais: remove do cache e do índice
+            await redis_client.delete(key)
+            await redis_client.srem(CHAVE_INDICE_CLIENTES, key)
+        else:
+            await redis_client.set(key, payload)
+            await redis_client.sadd(CHAVE_INDICE_CLIENTES, key)
+        _cache_local.pop(key, None)
+
+        # as projeções materializadas ficaram velhas; os endpoints /R* caem
+        # na montagem sob demanda até o próximo rebuild
+        await redis_client.delete(
+            "view:clientes",
+            "view:clientes_amigos",
+            "view:clientes_compras",
+            "view:amigos_recomendacoes",
+        )
+    except Exception:
+        # loga em vez de morrer como exceção não observada da task
+        logger.exception("Falha ao reconsolidar o cliente %s no Redis", cliente_id)
 
-    dados = {
-        "cliente": cliente,
-        "compras": compras,
-        "interesses": interesses,
-        "tags_comportamento": tags_comportamento,
-        "amigos": amigos,
-        "indicacoes": indicacoes,
-    }
 
-    return dados
+def _ao_notificar_cliente(conn, pid, channel, payload):
+    """Callback do LISTEN; agenda o refresh sem bloquear a conexão."""
+    try:
+        cliente_id = int(payload)
+    except (TypeError, ValueError):
+        return
+    task = asyncio.create_task(_refrescar_cliente(cliente_id))
+    _tarefas_refresh.add(task)
+    task.add_done_callback(_tarefas_refresh.discard)
 
 
-def chave_redis_cliente(cliente_id: int) -> str:
-    return f"cliente:{cliente_id}"
+# serializar é CPU puro, então em bases grandes o rebuild espalha essa
+# etapa por processos (threads não ajudam por causa do GIL). Abaixo do
+# limiar o overhead de mandar os dicts para os workers não compensa.
+LIMIAR_SERIALIZACAO_PARALELA = 1000
+_process_pool: ProcessPoolExecutor | None = None
+
+
+def _obter_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _process_pool
+
+
+# cache local em RAM na frente do Redis: clientes "quentes" respondem
+# sem round trip nem parse de JSON. Guarda o payload JÁ serializado
+# (bytes), então o hit devolve direto via Response. TTL curto para não
+# servir dado velho demais.
+_cache_local: TTLCache = TTLCache(maxsize=10_000, ttl=30)
 
 
 
 @app.get("/clientes")
-def listar_clientes():
+async def listar_clientes():
     """
     Lista todos os clientes direto do PostgreSQL.
     (Útil para conferência dos dados fonte)
     """
-    with pg_conn.cursor(cursor_factory=RealDictCursor) as cur:
-        cur.execute("SELECT * FROM clientes ORDER BY id;")
-        clientes = cur.fetchall()
-    return {"clientes": clientes}
+    async with pg_pool.acquire() as conn:
+        rows = await conn.fetch("SELECT * FROM clientes ORDER BY id;")
+    return {"clientes": [dict(r) for r in rows]}
 
 
 @app.get("/clientes/{cliente_id}")
-def detalhar_cliente(cliente_id: int):
+async def detalhar_cliente(cliente_id: int):
     """
     Detalha um cliente com suas compras (apenas Postgres).
     """
-    with pg_conn.cursor(cursor_factory=RealDictCursor) as cur:
-        cur.execute("SELECT * FROM clientes WHERE id = %s;", (cliente_id,))
-        cliente = cur.fetchone()
-        if not cliente:
+    async with pg_pool.acquire() as conn:
+        row = await conn.fetchrow("SELECT * FROM clientes WHERE id = $1;", cliente_id)
+        if not row:
             raise HTTPException(status_code=404, detail="Cliente não encontrado")
 
-        cur.execute(
+        rows = await conn.fetch(
             """
             SELECT c.id, p.produto, p.tipo, p.valor, c.data
             FROM compras c
             JOIN produtos p ON p.id = c.id_produto
-            WHERE c.id_cliente = %s
+            WHERE c.id_cliente = $1
             ORDER BY c.data DESC;
             """,
-            (cliente_id,),
+            cliente_id,
         )
-        compras = cur.fetchall()
 
-    return {"cliente": cliente, "compras": compras}
+    return {"cliente": dict(row), "compras": [dict(r) for r in rows]}
 
 
 # --------------------------
@@ -201,7 +409,7 @@ def detalhar_cliente(cliente_id: int):
 
 
 @app.get("/recomendacoes/{cliente_id}")
-def gerar_recomendacoes(cliente_id: int):
+async def gerar_recomendacoes(cliente_id: int):
     """
     Endpoint que integra:
     - PostgreSQL: dados do cliente + compras
@@ -212,64 +420,220 @@ def gerar_recomendacoes(cliente_id: int):
 
     key = chave_redis_cliente(cliente_id)
 
+    # 1º nível: cache local (bytes prontos, sem re-serializar)
+    local = _cache_local.get(key)
+    if local is not None:
+        return Response(content=local, media_type="application/json")
 
-    cached = redis_client.get(key)
+    # 2º nível: Redis. O payload guardado não tem "origem", então o campo
+    # é emendado nos bytes — sem json.loads nem re-serialização no hit.
+    cached = await redis_client.get(key)
     if cached:
-        data = json.loads(cached)
-        data["origem"] = "cache_redis"
-        return data
-
-
-    dados = montar_dados_consolidados_cliente(cliente_id)
-
-    response = {
-        "origem": "bancos",
-        **dados,
-    }
-
+        _cache_local[key] = b'{"origem":"cache_local",' + cached[1:]
+        return Response(
+            content=b'{"origem":"cache_redis",' + cached[1:],
+            media_type="application/json",
+        )
 
-    data_to_cache = jsonable_encoder(dados)  
-    redis_client.set(key, json.dumps(data_to_cache))
+    # 3º nível: bancos (o payload já chega serializado)
+    payload = await montar_payload_consolidado_cliente(cliente_id)
 
-    return response
+    await redis_client.set(key, payload)
+    _cache_local[key] = b'{"origem":"cache_local",' + payload[1:]
 
+    return Response(
+        content=b'{"origem":"bancos",' + payload[1:],
+        media_type="application/json",
+    )
 
 
 
 
 @app.post("/redis/rebuild")
-def redis_rebuild():
+async def redis_rebuild():
     """
     Limpa a base Redis e reconstrói os dados consolidados
     de TODOS os clientes a partir dos demais bancos.
 
+    Em vez de consultar os bancos cliente por cliente (5 queries * M
+    clientes), busca TUDO em 5 queries de tamanho constante — uma por
+    conjunto de dados — e agrupa em Python. As três bases ainda são
+    consultadas concorrentes entre si.
+
     Esta rota implementa:
     - limpeza do cache
     - replicação dos dados das 3 bases para a 4ª base (Redis)
+
+    Com os triggers de NOTIFY no Postgres mantendo as chaves atualizadas
+    incrementalmente, este rebuild completo fica como reset de emergência.
     """
     try:
 
-        redis_client.flushdb()
-
-
-        with pg_conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute("SELECT id FROM clientes ORDER BY id;")
-            clientes = cur.fetchall()
-
-        total = 0
-
+        # asynchronous=True: o Redis apaga em background e responde na hora
+        await redis_client.flushdb(asynchronous=True)
+        _cache_local.clear()
+
+        async def buscar_postgres():
+            # o json_agg monta o array de compras de cada cliente no
+            # próprio Postgres (via idx_compras_cliente_data), sem
+            # agrupamento linha a linha em Python
+            async with pg_pool.acquire() as conn:
+                clientes = await conn.fetch("SELECT * FROM clientes ORDER BY id;")
+                compras = await conn.fetch(
+                    """
+                    SELECT c.id_cliente,
+                           json_agg(
+                               json_build_object(
+                                   'id', c.id,
+                                   'produto', p.produto,
+                                   'tipo', p.tipo,
+                                   'valor', p.valor,
+                                   'data', c.data
+                               )
+                               ORDER BY c.data DESC
+                           ) AS compras
+                    FROM compras c
+                    JOIN produtos p ON p.id = c.id_produto
+                    GROUP BY c.id_cliente;
+                    """
+                )
+            return clientes, compras
+
+        async def buscar_mongo():
+            cursor = mongo_db.clientes_interesses.find({}, {"_id": 0})
+            return await cursor.to_list(length=None)
+
+        async def buscar_neo4j():
+            # execute_query gerencia as sessões em pool, então as duas
+            # queries podem inclusive rodar em paralelo
+            res_amigos, res_indicacoes = await asyncio.gather(
+                neo4j_driver.execute_query(
+                    """
+                    MATCH (c:Cliente)-[:AMIGO_DE]->(amigo:Cliente)
+                    RETURN c.id_cliente AS cid,
+                           amigo.id_cliente AS id_cliente, amigo.nome AS nome
+                    """,
+                    database_="neo4j",
+                ),
+                neo4j_driver.execute_query(
+                    """
+                    MATCH (c:Cliente)-[r:INDICOU]->(amigo:Cliente)
+                    RETURN c.id_cliente AS cid,
+                           amigo.id_cliente AS id_cliente, amigo.nome AS nome,
+                           r.produto AS produto
+                    """,
+                    database_="neo4j",
+                ),
+            )
+            amigos = [record.data() for record in res_amigos.records]
+            indicacoes = [record.data() for record in res_indicacoes.records]
+            return amigos, indicacoes
+
+        (clientes_rows, compras_rows), docs_interesses, (amigos_rows, indicacoes_rows) = (
+            await asyncio.gather(buscar_postgres(), buscar_mongo(), buscar_neo4j())
+        )
 
-        for row in clientes:
+        # monta tabelas de consulta por id_cliente (asyncpg devolve a
+        # coluna json como texto, então só falta um parse por cliente)
+        compras_por_cliente = {
+            r["id_cliente"]: orjson.loads(r["compras"]) for r in compras_rows
+        }
+        interesses_por_cliente = {d["cliente_id"]: d for d in docs_interesses}
+
+        amigos_por_cliente = {}
+        for r in amigos_rows:
+            amigos_por_cliente.setdefault(r["cid"], []).append(
+                {"id_cliente": r["id_cliente"], "nome": r["nome"]}
+            )
+
+        indicacoes_por_cliente = {}
+        for r in indicacoes_rows:
+            indicacoes_por_cliente.setdefault(r["cid"], []).append(
+                {"id_cliente": r["id_cliente"], "nome": r["nome"], "produto": r["produto"]}
+            )
+
+        consolidados = []
+        for row in clientes_rows:
             cid = row["id"]
-            dados = montar_dados_consolidados_cliente(cid)
-            key = chave_redis_cliente(cid)
-            redis_client.set(key, json.dumps(jsonable_encoder(dados)))
-            total += 1
+            doc = interesses_por_cliente.get(cid, {})
+            consolidados.append({
+                "cliente": dict(row),
+                "compras": compras_por_cliente.get(cid, []),
+                "interesses": doc.get("interesses", []),
+                "tags_comportamento": doc.get("tags_comportamento", []),
+                "amigos": amigos_por_cliente.get(cid, []),
+                "indicacoes": indicacoes_por_cliente.get(cid, []),
+            })
+
+        # etapa de serialização: paralela por processos quando há payload
+        # suficiente para amortizar o custo de despacho
+        if len(consolidados) >= LIMIAR_SERIALIZACAO_PARALELA:
+            pool = _obter_process_pool()
+            payloads = await asyncio.to_thread(
+                lambda: list(pool.map(serializar, consolidados, chunksize=256))
+            )
+        else:
+            payloads = [serializar(d) for d in consolidados]
+
+        # escreve em pipeline, em vez de um SET por cliente; descarrega a
+        # cada 500 chaves para não acumular um buffer gigante em memória
+        pipe = redis_client.pipeline(transaction=False)
+        for i, (dados, payload) in enumerate(zip(consolidados, payloads), start=1):
+            cid = dados["cliente"]["id"]
+            pipe.set(chave_redis_cliente(cid), payload)
+            pipe.sadd(CHAVE_INDICE_CLIENTES, chave_redis_cliente(cid))
+            if i % 500 == 0:
+                await pipe.execute()
+
+        # materializa as projeções dos endpoints /R* uma única vez; cada
+        # leitura vira um GET + repasse de bytes, sem remontagem em Python
+        pipe.set(
+            "view:clientes",
+            serializar({
+                "origem": "redis",
+                "clientes": [d["cliente"] for d in consolidados],
+            }),
+        )
+        pipe.set(
+            "view:clientes_amigos",
+            serializar({
+                "origem": "redis",
+                "clientes_amigos": [
+                    {"cliente": d["cliente"], "amigos": d["amigos"]}
+                    for d in consolidados
+                ],
+            }),
+        )
+        pipe.set(
+            "view:clientes_compras",
+            serializar({
+                "origem": "redis",
+                "clientes_compras": [
+                    {"cliente": d["cliente"], "compras": d["compras"]}
+                    for d in consolidados
+                ],
+            }),
+        )
+        pipe.set(
+            "view:amigos_recomendacoes",
+            serializar({
+                "origem": "redis",
+                "amigos_recomendacoes": [
+                    {
+                        "cliente": d["cliente"],
+                        "amigos": d["amigos"],
+                        "indicacoes": d["indicacoes"],
+                    }
+                    for d in consolidados
+                ],
+            }),
+        )
+        await pipe.execute()
 
         return {
             "status": "ok",
             "mensagem": "Redis reconstruído com sucesso",
-            "total_clientes": total,
+            "total_clientes": len(clientes_rows),
         }
     except HTTPException:
 
@@ -280,40 +644,55 @@ def redis_rebuild():
 
 
 
-def _carregar_todos_clientes_redis():
+async def _carregar_todos_clientes_redis():
     """
     Lê todos os clientes consolidados do Redis (cliente:*).
     Retorna uma lista de dicionários com a estrutura consolidada.
     """
-    keys = redis_client.keys("cliente:*")
+    # preferimos o índice secundário montado no rebuild; sem ele, SCAN
+    # cursor a cursor (não bloqueia o Redis, ao contrário do KEYS)
+    keys = sorted(await redis_client.smembers(CHAVE_INDICE_CLIENTES))
+    if not keys:
+        keys = [k async for k in redis_client.scan_iter(match="cliente:*", count=1000)]
+
     dados = []
-    for k in keys:
-        raw = redis_client.get(k)
-        if not raw:
-            continue
-        try:
-            dados.append(json.loads(raw))
-        except json.JSONDecodeError:
-            continue
+    # MGET em blocos de 500: O(N/500) round trips em vez de um GET por chave
+    for i in range(0, len(keys), 500):
+        for raw in await redis_client.mget(keys[i : i + 500]):
+            if not raw:
+                continue
+            try:
+                dados.append(orjson.loads(raw))
+            except orjson.JSONDecodeError:
+                continue
     return dados
 
 
 @app.get("/Rclientes")
-def redis_listar_clientes():
+async def redis_listar_clientes():
     """
     Mostrar os dados de todos os clientes (somente Redis).
     """
-    dados = _carregar_todos_clientes_redis()
+    raw = await redis_client.get("view:clientes")
+    if raw:
+        return Response(content=raw, media_type="application/json")
+
+    # sem view materializada (Redis populado fora do rebuild): monta na hora
+    dados = await _carregar_todos_clientes_redis()
     clientes = [d["cliente"] for d in dados if "cliente" in d]
     return {"origem": "redis", "clientes": clientes}
 
 
 @app.get("/Rclientes-amigos")
-def redis_clientes_amigos():
+async def redis_clientes_amigos():
     """
     Mostrar os dados dos clientes e seus amigos (somente Redis).
     """
-    dados = _carregar_todos_clientes_redis()
+    raw = await redis_client.get("view:clientes_amigos")
+    if raw:
+        return Response(content=raw, media_type="application/json")
+
+    dados = await _carregar_todos_clientes_redis()
 
     resultado = []
     for d in dados:
@@ -328,11 +707,15 @@ def redis_clientes_amigos():
 
 
 @app.get("/Rclientes-compras")
-def redis_clientes_compras():
+async def redis_clientes_compras():
     """
     Mostrar os dados dos clientes e as compras realizadas por eles (somente Redis).
     """
-    dados = _carregar_todos_clientes_redis()
+    raw = await redis_client.get("view:clientes_compras")
+    if raw:
+        return Response(content=raw, media_type="application/json")
+
+    dados = await _carregar_todos_clientes_redis()
 
     resultado = []
     for d in dados:
@@ -347,14 +730,18 @@ def redis_clientes_compras():
 
 
 @app.get("/Ramigos-recomendacoes")
-def redis_amigos_recomendacoes():
+async def redis_amigos_recomendacoes():
     """
     Listar os dados dos amigos dos clientes e as possíveis recomendações para eles (somente Redis).
 
     Aqui, as "recomendações" são consideradas como as relações 'indicacoes'
     armazenadas para cada cliente, que contêm amigo + produto indicado.
     """
-    dados = _carregar_todos_clientes_redis()
+    raw = await redis_client.get("view:amigos_recomendacoes")
+    if raw:
+        return Response(content=raw, media_type="application/json")
+
+    dados = await _carregar_todos_clientes_redis()
 
     resultado = []
     for d in dados: